@@ -4,11 +4,14 @@ Solveur de Sudoku
 Permet de charger et résoudre des grilles de Sudoku avec différents algorithmes.
 """
 
+import os
 import sys
 import time
-from utils import SudokuGrid, load_grid_from_file, save_grid_to_file, get_solution_filename, find_file_in_raw
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from utils import SudokuGrid, SolutionCache, load_grid_from_file, save_grid_to_file, get_solution_filename, find_file_in_raw
 from solvers.sudoku_solver_backtracking import SudokuSolver as BacktrackingSolver
 from solvers.sudoku_solver_bruteforce import SudokuSolver as BruteforceSolver
+from solvers.sudoku_solver_dlx import SudokuSolver as DancingLinksSolver
 from solvers.sudoku_solver_backtracking_human_reflexion import SudokuSolver as HumanReflexionSolver
 
 
@@ -18,20 +21,23 @@ def get_solver_choice():
     print("1. Backtracking (recommandé)")
     print("2. Brute Force")
     print("3. Human Reflexion Backtracking")
+    print("4. Dancing Links (couverture exacte)")
     
     while True:
-        choice = input("\nVotre choix (1-2): ").strip()
+        choice = input("\nVotre choix (1-4): ").strip()
         if choice == "1":
             return BacktrackingSolver, "backtracking"
         elif choice == "2":
             return BruteforceSolver, "brute force"
         elif choice == "3":
             return HumanReflexionSolver, "human reflexion backtracking"
+        elif choice == "4":
+            return DancingLinksSolver, "dancing links"
         else:
-            print("Choix invalide. Veuillez choisir 1, 2 ou 3.")
+            print("Choix invalide. Veuillez choisir 1, 2, 3 ou 4.")
 
 
-def solve_grid(grid, solver_class, algorithm_name):
+def solve_grid(grid, solver_class, algorithm_name, propagate=False):
     """
     Résout une grille avec l'algorithme choisi
     
@@ -39,17 +45,30 @@ def solve_grid(grid, solver_class, algorithm_name):
         grid: La grille à résoudre
         solver_class: La classe du solver à utiliser
         algorithm_name: Le nom de l'algorithme (pour l'affichage)
+        propagate: Placer d'abord les cellules forcées (SudokuGrid._propagate)
+            avant de lancer le solveur ; désactivé par défaut pour comparer
+            les algorithmes tels quels
         
     Returns:
         True si la grille est résolue, False sinon
     """
-    solver_grid = grid.copy()
+    if propagate:
+        # Prétraitement sur une copie : la grille d'origine n'est pas modifiée
+        empty_before = grid.grid.count(0)
+        grid = grid.copy()
+        if not grid._propagate():
+            print("Impossible de résoudre cette grille!")
+            return None
+        print(f"Prétraitement : {empty_before - grid.grid.count(0)} cellule(s) forcée(s) placée(s)")
     
     print(f"\nRésolution en cours (algorithme de {algorithm_name})...")
-    solver = solver_class(solver_grid.grid)
+    
+    solver = solver_class(grid.grid)
     
     if solver.solve():
         print("Grille résolue avec succès!")
+        solver_grid = SudokuGrid(grid.size)
+        solver_grid.grid = solver.grid
         solver_grid.display()
         return solver_grid
     else:
@@ -57,6 +76,125 @@ def solve_grid(grid, solver_class, algorithm_name):
         return None
 
 
+def _solve_one(grid):
+    """
+    Résout une grille avec le backtracking (exécuté dans un processus de travail)
+    
+    Args:
+        grid: Grille à résoudre
+        
+    Returns:
+        La grille résolue, ou None si elle n'a pas de solution
+    """
+    solver = BacktrackingSolver(grid.grid)
+    
+    if solver.solve():
+        grid.grid = solver.grid
+        return grid
+    return None
+
+
+def solve_batch(filenames, workers=None, use_cache=False):
+    """
+    Résout plusieurs grilles en parallèle, chaque grille dans un processus
+    
+    Les grilles sont indépendantes : on les répartit sur les cœurs
+    disponibles avec un pool de processus (contourne le GIL).
+    
+    Les grilles sont chargées par le processus principal. Si use_cache est
+    vrai, elles sont d'abord cherchées dans le cache de solutions (le
+    processus principal est le seul à accéder au fichier de cache) et
+    seules les grilles absentes du cache sont envoyées aux processus de
+    travail. Le temps de résolution affiché ne compte que ces dernières.
+    
+    Les grilles ayant le plus de cellules vides (les plus longues à
+    résoudre) sont soumises en premier pour qu'une grande grille lancée en
+    dernier ne laisse pas les autres cœurs inactifs. Les résultats sont
+    traités au fil de l'eau (as_completed) : chaque grille est signalée dès
+    qu'elle est terminée, sans attendre celles qui la précèdent.
+    
+    Args:
+        filenames: Liste des fichiers à résoudre
+        workers: Nombre de processus (par défaut, le nombre de cœurs)
+        use_cache: Réutiliser et enregistrer les solutions dans le cache disque
+        
+    Returns:
+        Liste des grilles résolues (None en cas d'échec), dans l'ordre des fichiers
+    """
+    workers = workers or os.cpu_count()
+    results = [None] * len(filenames)
+    cache = SolutionCache() if use_cache else None
+    pending = []
+    
+    for i, filename in enumerate(filenames):
+        try:
+            grid = load_grid_from_file(filename)
+        except FileNotFoundError:
+            print(f"Erreur: Le fichier '{filename}' n'existe pas")
+            continue
+        except ValueError as e:
+            print(f"Erreur de format dans '{filename}': {e}")
+            continue
+        
+        results[i] = cache.get(grid) if cache else None
+        if results[i]:
+            print(f"  - {filename}: résolue (cache)")
+        else:
+            pending.append((i, grid))
+    
+    if not pending:
+        return results
+    
+    pending.sort(key=lambda item: item[1].grid.count(0), reverse=True)
+    
+    begin_time = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_solve_one, grid): (i, grid) for i, grid in pending}
+        
+        for future in as_completed(futures):
+            i, grid = futures[future]
+            solved_grid = results[i] = future.result()
+            if solved_grid and cache:
+                cache.put(grid, solved_grid)
+            print(f"  - {filenames[i]}: {'résolue' if solved_grid else 'sans solution'}")
+    
+    elapsed_time = time.time() - begin_time
+    print(f"Temps de résolution : {elapsed_time:.2f} secondes ({len(pending)} grille(s) passée(s) au solveur)")
+    
+    return results
+
+
+def run_batch(source, workers=None, use_cache=False):
+    """
+    Résout un lot de grilles et sauvegarde les solutions
+    
+    Args:
+        source: Dossier dont toutes les grilles (.txt) sont résolues, ou
+            fichier contenant un nom de grille par ligne
+        workers: Nombre de processus (par défaut, le nombre de cœurs)
+        use_cache: Réutiliser et enregistrer les solutions dans le cache disque
+    """
+    if os.path.isdir(source):
+        filenames = sorted(os.path.join(source, name) for name in os.listdir(source)
+                           if name.endswith('.txt'))
+    else:
+        with open(source, 'r') as file:
+            filenames = [find_file_in_raw(line.strip()) for line in file if line.strip()]
+    
+    print(f"Résolution de {len(filenames)} grille(s) en parallèle...")
+    solved_grids = solve_batch(filenames, workers, use_cache)
+    
+    solved_count = 0
+    for filename, solved_grid in zip(filenames, solved_grids):
+        if solved_grid:
+            save_grid_to_file(solved_grid, get_solution_filename(filename))
+            solved_count += 1
+        else:
+            print(f"Impossible de résoudre la grille {filename}")
+    
+    print(f"{solved_count}/{len(filenames)} grille(s) résolue(s)")
+
+
 def main():
     """Fonction principale avec menu interactif pour la résolution"""
     print("=== Solveur de Sudoku ===")
@@ -111,25 +249,66 @@ def main():
 
 
 if __name__ == "__main__":
+    # Options facultatives (--propagate : placer les cellules forcées avant
+    # de lancer le solveur ; --cache : réutiliser les solutions déjà
+    # calculées, en mode batch uniquement), retirées des arguments positionnels
+    options = {"--propagate", "--cache"}
+    args = [arg for arg in sys.argv[1:] if arg not in options]
+    propagate = "--propagate" in sys.argv
+    use_cache = "--cache" in sys.argv
+    
+    if use_cache and args[:1] != ["--batch"]:
+        print("Erreur: L'option --cache ne s'applique qu'avec --batch")
+        sys.exit(1)
+    
+    # Mode batch: python main.py --batch <dossier | fichier_de_fichiers> [nb_processus] [--cache]
+    if len(args) > 1 and args[0] == "--batch":
+        print("=== Solveur de Sudoku - Mode batch ===")
+        
+        if propagate:
+            print("Erreur: L'option --propagate ne s'applique pas au mode batch")
+            sys.exit(1)
+        
+        workers = None
+        if len(args) > 2:
+            try:
+                workers = int(args[2])
+                if workers < 1:
+                    raise ValueError
+            except ValueError:
+                print(f"Erreur: Nombre de processus invalide '{args[2]}'")
+                sys.exit(1)
+        
+        try:
+            run_batch(args[1], workers, use_cache)
+        except FileNotFoundError:
+            print(f"Erreur: Le fichier '{args[1]}' n'existe pas")
+        except ValueError as e:
+            print(f"Erreur de format dans '{args[1]}': {e}")
+    
     # Vérifier si un fichier est passé en argument
-    if len(sys.argv) > 1:
+    elif len(args) > 0:
         # Mode ligne de commande
-        filename = sys.argv[1]
+        filename = args[0]
         
-        # Optionnel: spécifier l'algorithme en deuxième argument (1 = backtracking, 2 = bruteforce)
+        # Optionnel: spécifier l'algorithme en deuxième argument
+        # (1 = brute force, 2 = backtracking, 3 = human reflexion, 4 = dancing links)
         solver_class = BacktrackingSolver
         algorithm_name = "backtracking"
         
-        if len(sys.argv) > 2:
-            if sys.argv[2] == "1":
+        if len(args) > 1:
+            if args[1] == "1":
                 solver_class = BruteforceSolver
                 algorithm_name = "brute force"
-            elif sys.argv[2] == "2":
+            elif args[1] == "2":
                 solver_class = BacktrackingSolver
                 algorithm_name = "backtracking"
-            elif sys.argv[2] == "3":
+            elif args[1] == "3":
                 solver_class = HumanReflexionSolver
                 algorithm_name = "human reflexion backtracking"
+            elif args[1] == "4":
+                solver_class = DancingLinksSolver
+                algorithm_name = "dancing links"
         
         # Chercher le fichier dans data/raw/ si nécessaire
         filename = find_file_in_raw(filename)
@@ -146,7 +325,7 @@ if __name__ == "__main__":
             begin_time = time.time()
             
             # Résoudre la grille
-            solved_grid = solve_grid(grid, solver_class, algorithm_name)
+            solved_grid = solve_grid(grid, solver_class, algorithm_name, propagate)
             
             end_time = time.time()
             elapsed_time = end_time - begin_time
@@ -18,54 +18,62 @@ Il faut que la taille de la grille soit un carré parfait (4, 9, 16, 25, etc.)
 import os
 import sys
 import math
-from typing import List, Tuple, Optional
-from utils import SudokuGrid, char_to_value, save_grid_to_file
+from typing import List, Tuple, Optional, Union
+from utils import SudokuGrid, char_to_value, decode_chars, is_perfect_square, save_grid_to_file
 
 
-def parse_line_to_grid(line: str) -> Tuple[SudokuGrid, int]:
+def parse_line_to_grid(line: Union[str, bytes]) -> Tuple[SudokuGrid, int]:
     """
     Parse une ligne de texte en grille de sudoku
     
     Args:
-        line: Ligne contenant la grille (ex: "9..8...........5............")
+        line: Ligne contenant la grille (ex: "9..8...........5............"),
+            en str ou directement en bytes lus depuis un fichier
         
     Returns:
         Tuple (grille, taille) ou lève une exception si la ligne est invalide
     """
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    
     # Nettoyer la ligne
-    line = line.strip().replace(' ', '')
+    line = line.strip().replace(b' ', b'')
     
     if not line:
         raise ValueError("Ligne vide")
     
-    # Déterminer la taille de la grille
-    total_cells = len(line)
-    size = int(math.sqrt(total_cells))
-    
-    if size * size != total_cells:
+    # Déterminer la taille de la grille (un caractère non ASCII occupe plusieurs octets)
+    total_cells = len(line) if line.isascii() else len(line.decode('utf-8', 'replace'))
+    if not is_perfect_square(total_cells):
         raise ValueError(f"La ligne contient {total_cells} cellules, ce n'est pas un carré parfait")
     
+    size = math.isqrt(total_cells)
+    
     # Vérifier que la taille est elle-même un carré parfait
-    box_size = int(math.sqrt(size))
-    if box_size * box_size != size:
+    if not is_perfect_square(size):
         raise ValueError(f"La taille {size} n'est pas un carré parfait valide pour un sudoku")
     
     # Créer la grille
     grid = SudokuGrid(size)
     
-    # Remplir la grille
-    for i in range(size):
-        for j in range(size):
-            idx = i * size + j
-            char = line[idx]
+    # Convertir toute la ligne en une seule passe (au niveau C)
+    values = decode_chars(line)
+    
+    if max(values) > size:
+        # Repasser caractère par caractère pour signaler précisément le premier fautif
+        values = []
+        for idx, char in enumerate(line.decode('utf-8', 'replace')):
             try:
                 value = char_to_value(char)
                 if value < 0 or value > size:
                     raise ValueError(f"Valeur {value} hors limites pour une grille {size}x{size}")
-                grid.grid[i][j] = value
+                values.append(value)
             except ValueError as e:
                 raise ValueError(f"Caractère invalide '{char}' à la position {idx+1}: {e}")
     
+    # Remplir la grille
+    grid.grid = bytes(values)
+    
     return grid, size
 
 
@@ -87,9 +95,9 @@ def parse_grids_from_file(input_file: str, output_dir: str = "data/raw", base_na
     # Créer le dossier de sortie s'il n'existe pas
     os.makedirs(output_dir, exist_ok=True)
     
-    # Lire toutes les lignes
-    with open(input_file, 'r') as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
+    # Lire tout le fichier d'un bloc et découper en lignes sans décoder le texte
+    with open(input_file, 'rb') as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
     
     if not lines:
         raise ValueError("Le fichier est vide")
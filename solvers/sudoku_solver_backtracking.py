@@ -4,104 +4,293 @@ Algorithme de résolution de Sudoku par backtracking
 Ce fichier contient uniquement la logique de résolution pour une compréhension facile
 """
 
-from typing import Tuple, Optional
+from array import array
+from itertools import chain
+from math import isqrt
+from typing import Dict
+
+
+# Taille de grille à partir de laquelle l'heuristique LCV est utilisée : en
+# 9x9, le coût du tri des chiffres à chaque nœud dépasse le gain sur
+# l'arbre de recherche ; en 16x16, elle réduit nettement le temps total
+LCV_MIN_SIZE = 16
+
+
+def solve_kernel(buf: bytearray, row_mask: list, col_mask: list, box_mask: list,
+                 empties: list, box_of: array, full_mask: int, limit: int = 1,
+                 lcv: bool = False) -> int:
+    """
+    Cœur du backtracking, sous forme itérative
+    
+    Toute la recherche travaille sur des variables locales passées en
+    argument : aucun accès aux attributs d'un objet dans la boucle chaude.
+    La récursion est remplacée par une pile explicite (`remaining`), ce qui
+    évite le coût des appels de fonction et la limite de récursion de Python.
+    
+    Si `lcv` est vrai, les chiffres d'une cellule sont essayés du moins
+    contraignant au plus contraignant (heuristique LCV : Least Constraining
+    Value), c'est-à-dire en commençant par celui qui retire le moins
+    d'options aux cellules vides de la même ligne, colonne ou sous-carré.
+    Sinon, ils sont essayés par ordre croissant.
+    
+    Principe:
+    1. Remplir les cellules n'ayant qu'un seul candidat (propagation), puis
+       choisir la cellule vide ayant le moins de candidats (heuristique MRV)
+    2. Essayer les nombres absents de sa ligne, colonne et sous-carré
+       (du moins contraignant au plus contraignant si `lcv` est vrai)
+    3. Placer le nombre et passer au niveau suivant
+    4. Si aucun nombre ne convient, revenir au niveau précédent (backtrack)
+    5. Une grille complète compte comme une solution ; tant que `limit`
+       n'est pas atteint, on revient en arrière pour chercher la suivante
+    
+    Args:
+        buf: Grille aplatie (cellule (r, c) à l'indice r*size + c), modifiée sur place
+        row_mask: Masques des chiffres placés par ligne
+        col_mask: Masques des chiffres placés par colonne
+        box_mask: Masques des chiffres placés par sous-carré
+        empties: Cellules vides (indice, ligne, colonne), réordonnées sur place
+        box_of: Indice du sous-carré de chaque cellule (par indice à plat)
+        full_mask: Masque avec les `size` bits de poids faible à 1
+        limit: Nombre de solutions à partir duquel la recherche s'arrête
+        lcv: Ordonner les chiffres avec l'heuristique LCV
+    
+    Returns:
+        Nombre de solutions trouvées (au plus `limit`). Si `limit` est
+        atteint, buf contient la dernière solution trouvée.
+    """
+    count_empties = len(empties)
+    # Candidats restant à essayer pour la cellule de chaque niveau
+    # (bits rangés du plus au moins contraignant, le prochain est en fin de liste)
+    remaining = [[] for _ in range(count_empties + 1)]
+    # Nombre de cellules vides déjà remplies
+    depth = 0
+    solutions = 0
+    # Borne supérieure du nombre de candidats d'une cellule (size + 1)
+    max_count = full_mask.bit_length() + 1
+    
+    while True:
+        # Propagation : placer d'office les cellules n'ayant qu'un seul
+        # candidat, jusqu'à ce qu'un passage complet n'en trouve plus.
+        # Ce dernier passage sert aussi à choisir la cellule ayant le moins
+        # de candidats (heuristique MRV).
+        dead_end = False
+        progress = True
+        while progress and not dead_end:
+            progress = False
+            best = depth
+            best_count = max_count
+            for i in range(depth, count_empties):
+                idx, row, col = empties[i]
+                candidates = ~(row_mask[row] | col_mask[col] | box_mask[box_of[idx]]) & full_mask
+                if candidates & (candidates - 1):
+                    # Plusieurs candidats : retenir la cellule la plus contrainte
+                    count = candidates.bit_count()
+                    if count < best_count:
+                        best, best_count = i, count
+                elif candidates:
+                    # Un seul candidat : le placer comme un niveau sans alternative,
+                    # il sera annulé automatiquement lors du backtrack
+                    empties[depth], empties[i] = empties[i], empties[depth]
+                    buf[idx] = candidates.bit_length()
+                    row_mask[row] |= candidates
+                    col_mask[col] |= candidates
+                    box_mask[box_of[idx]] |= candidates
+                    remaining[depth] = []
+                    depth += 1
+                    progress = True
+                else:
+                    # Aucun candidat : impasse
+                    dead_end = True
+                    break
+        
+        if depth == count_empties:
+            # Toutes les cellules vides sont remplies : une solution de plus
+            solutions += 1
+            if solutions == limit:
+                return solutions
+            dead_end = True
+        
+        if dead_end:
+            remaining[depth] = []
+        else:
+            empties[depth], empties[best] = empties[best], empties[depth]
+            idx, row, col = empties[depth]
+            box = box_of[idx]
+            candidates = ~(row_mask[row] | col_mask[col] | box_mask[box]) & full_mask
+            
+            bits = []
+            while candidates:
+                bit = candidates & -candidates
+                candidates ^= bit
+                bits.append(bit)
+            
+            if lcv:
+                # Candidats des cellules vides voisines (même ligne, colonne ou sous-carré)
+                peer_candidates = []
+                for i in range(depth + 1, count_empties):
+                    peer_idx, peer_row, peer_col = empties[i]
+                    peer_box = box_of[peer_idx]
+                    if peer_row == row or peer_col == col or peer_box == box:
+                        peer_candidates.append(
+                            ~(row_mask[peer_row] | col_mask[peer_col] | box_mask[peer_box]) & full_mask)
+                
+                # Ranger les chiffres selon le nombre de voisins qui les perdraient
+                bits.sort(key=lambda bit: sum(1 for peer in peer_candidates if peer & bit), reverse=True)
+            else:
+                # Ordre croissant : le plus petit chiffre en fin de liste
+                bits.reverse()
+            remaining[depth] = bits
+        
+        # Backtrack: remonter tant que le niveau courant n'a plus de candidat
+        while not remaining[depth]:
+            if depth == 0:
+                # Tout l'arbre de recherche a été exploré
+                return solutions
+            depth -= 1
+            
+            # Annuler le placement du niveau précédent
+            idx, row, col = empties[depth]
+            bit = 1 << (buf[idx] - 1)
+            buf[idx] = 0
+            row_mask[row] ^= bit
+            col_mask[col] ^= bit
+            box_mask[box_of[idx]] ^= bit
+        
+        # Prendre le chiffre le moins contraignant restant
+        idx, row, col = empties[depth]
+        bit = remaining[depth].pop()
+        
+        # Placer le nombre et passer au niveau suivant
+        buf[idx] = bit.bit_length()
+        row_mask[row] |= bit
+        col_mask[col] |= bit
+        box_mask[box_of[idx]] |= bit
+        depth += 1
 
 
 class SudokuSolver:
     """Solveur de Sudoku utilisant l'algorithme de backtracking"""
     
-    def __init__(self, grid: list):
+    # Tables ne dépendant que de la taille de la grille, calculées une seule
+    # fois par taille et partagées par toutes les instances
+    _TABLES: Dict[int, dict] = {}
+    
+    def __init__(self, grid):
         """
         Initialise le solveur avec une grille
         
-        Args:
-            grid: Grille de Sudoku (liste de listes)
-        """
-        self.grid = grid
-        self.size = len(grid)
-        self.box_size = int(self.size**0.5)
-    
-    def is_valid(self, row: int, col: int, num: int) -> bool:
-        """
-        Vérifie si un nombre peut être placé à une position donnée
+        La grille est recopiée dans un bytearray à plat (une seule zone
+        mémoire contiguë) sur lequel travaille la recherche : la grille
+        passée en argument n'est jamais modifiée. Après solve, la solution
+        est disponible dans self.grid.
+        
+        Les contraintes sont stockées sous forme de masques de bits : le bit k
+        de row_mask[r] (resp. col_mask[c], box_mask[b]) est à 1 si le chiffre
+        k+1 est déjà placé dans la ligne r (resp. colonne c, sous-carré b).
         
         Args:
-            row: Ligne
-            col: Colonne
-            num: Nombre à placer
-            
-        Returns:
-            True si le placement est valide, False sinon
+            grid: Grille de Sudoku (liste de listes), ou grille déjà aplatie
+                (bytes/bytearray de size*size valeurs, ligne par ligne)
         """
-        # Vérifier la ligne
-        for c in range(self.size):
-            if self.grid[row][c] == num:
-                return False
+        if isinstance(grid, (bytes, bytearray)):
+            self.buf = bytearray(grid)
+            self.size = isqrt(len(grid))
+        else:
+            self.buf = bytearray(chain.from_iterable(grid))
+            self.size = len(grid)
         
-        # Vérifier la colonne
-        for r in range(self.size):
-            if self.grid[r][col] == num:
-                return False
+        tables = SudokuSolver._TABLES.get(self.size)
+        if tables is None:
+            tables = SudokuSolver._TABLES[self.size] = self._build_tables(self.size)
         
-        # Vérifier le sous-carré
-        start_row = (row // self.box_size) * self.box_size
-        start_col = (col // self.box_size) * self.box_size
+        self.grid = None
+        self.box_size = tables['box_size']
+        self.full_mask = tables['full_mask']
+        self.box_of = tables['box_of']
+        self.lcv = tables['lcv']
         
-        for r in range(start_row, start_row + self.box_size):
-            for c in range(start_col, start_col + self.box_size):
-                if self.grid[r][c] == num:
-                    return False
+        self.row_mask = [0] * self.size
+        self.col_mask = [0] * self.size
+        self.box_mask = [0] * self.size
+        self.empties = []
         
-        return True
+        # Enregistrer les chiffres déjà présents dans la grille initiale
+        # et la liste des cellules vides
+        cells = tables['cells']
+        box_of = self.box_of
+        row_mask, col_mask, box_mask = self.row_mask, self.col_mask, self.box_mask
+        empties = self.empties
+        
+        for idx, value in enumerate(self.buf):
+            if value == 0:
+                empties.append(cells[idx])
+            else:
+                _, row, col = cells[idx]
+                bit = 1 << (value - 1)
+                row_mask[row] |= bit
+                col_mask[col] |= bit
+                box_mask[box_of[idx]] |= bit
     
-    def find_empty_cell(self) -> Optional[Tuple[int, int]]:
+    @staticmethod
+    def _build_tables(size: int) -> dict:
         """
-        Trouve la première cellule vide dans la grille
+        Construit les tables ne dépendant que de la taille de la grille
         
+        Args:
+            size: Taille de la grille
+            
         Returns:
-            Tuple (row, col) de la première cellule vide, ou None si la grille est complète
+            Dictionnaire contenant:
+            - box_size: taille d'un sous-carré
+            - full_mask: masque avec les `size` bits de poids faible à 1
+            - box_of: indice du sous-carré de chaque cellule (évite les divisions)
+            - cells: triplet (indice, ligne, colonne) de chaque cellule
+            - lcv: utiliser l'heuristique LCV pour cette taille
         """
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.grid[row][col] == 0:
-                    return (row, col)
-        return None
+        box_size = isqrt(size)
+        return {
+            'box_size': box_size,
+            'full_mask': (1 << size) - 1,
+            'box_of': array('B', [(row // box_size) * box_size + col // box_size
+                                  for row in range(size) for col in range(size)]),
+            'cells': tuple((row * size + col, row, col)
+                           for row in range(size) for col in range(size)),
+            'lcv': size >= LCV_MIN_SIZE,
+        }
     
     def solve(self) -> bool:
         """
         Résout la grille avec l'algorithme de backtracking
         
-        Principe:
-        1. Trouver une cellule vide
-        2. Essayer tous les nombres possibles (1 à size)
-        3. Si un nombre est valide, le placer et continuer récursivement
-        4. Si aucune solution n'est trouvée, revenir en arrière (backtrack)
+        La recherche elle-même est déléguée à solve_kernel. En cas de
+        succès, la solution est placée dans self.grid (liste de listes).
         
         Returns:
             True si la grille est résolue, False sinon
         """
-        # Trouver la première cellule vide
-        empty_cell = self.find_empty_cell()
+        if solve_kernel(self.buf, self.row_mask, self.col_mask, self.box_mask,
+                        self.empties, self.box_of, self.full_mask, lcv=self.lcv) == 0:
+            return False
         
-        # Si pas de cellule vide, la grille est complète
-        if not empty_cell:
-            return True
-        
-        row, col = empty_cell
+        # Construire la grille solution à partir du buffer
+        size = self.size
+        self.grid = [list(self.buf[row * size:(row + 1) * size]) for row in range(size)]
+        return True
+    
+    def count_solutions(self, limit: int = 2) -> int:
+        """
+        Compte les solutions de la grille, en s'arrêtant dès que `limit` est atteint
         
-        # Essayer tous les nombres de 1 à size
-        for num in range(1, self.size + 1):
-            # Vérifier si le nombre est valide à cette position
-            if self.is_valid(row, col, num):
-                # Placer le nombre
-                self.grid[row][col] = num
-                
-                # Continuer récursivement
-                if self.solve():
-                    return True
-                
-                # Backtrack: annuler le placement
-                self.grid[row][col] = 0
+        Avec limit=2 (valeur par défaut), permet de vérifier qu'une grille a
+        une solution unique sans explorer tout l'arbre de recherche.
+        La recherche travaille sur une copie de l'état : ni la grille ni le
+        solveur ne sont modifiés.
         
-        # Aucune solution trouvée
-        return False
+        Args:
+            limit: Nombre de solutions à partir duquel on arrête de compter
+            
+        Returns:
+            Nombre de solutions trouvées (au plus limit)
+        """
+        return solve_kernel(bytearray(self.buf), self.row_mask[:], self.col_mask[:], self.box_mask[:],
+                            self.empties[:], self.box_of, self.full_mask, limit, self.lcv)
@@ -4,7 +4,7 @@ Algorithme de résolution de Sudoku par backtracking
 Ce fichier contient uniquement la logique de résolution pour une compréhension facile
 """
 
-from typing import Tuple, Optional
+from math import isqrt
 
 
 class SudokuSolver:
@@ -14,65 +14,63 @@ class SudokuSolver:
         """
         Initialise le solveur avec une grille
         
-        Args:
-            grid: Grille de Sudoku (liste de listes)
-        """
-        self.grid = grid
-        self.size = len(grid)
-        self.box_size = int(self.size**0.5)
-    
-    def is_valid(self, row: int, col: int, num: int) -> bool:
-        """
-        Vérifie si un nombre peut être placé à une position donnée
+        Les nombres déjà placés sont mémorisés dans un ensemble par ligne,
+        par colonne et par sous-carré pour tester un placement en O(1).
+        
+        La résolution se fait sur une copie : la grille passée en argument
+        n'est pas modifiée, la solution est disponible dans self.grid.
         
         Args:
-            row: Ligne
-            col: Colonne
-            num: Nombre à placer
-            
-        Returns:
-            True si le placement est valide, False sinon
+            grid: Grille de Sudoku (liste de listes), ou grille déjà aplatie
+                (bytes/bytearray de size*size valeurs, ligne par ligne)
         """
-        # Vérifier la ligne
-        for c in range(self.size):
-            if self.grid[row][c] == num:
-                return False
+        if isinstance(grid, (bytes, bytearray)):
+            size = isqrt(len(grid))
+            self.grid = [list(grid[row * size:(row + 1) * size]) for row in range(size)]
+        else:
+            self.grid = [row[:] for row in grid]
+        self.size = len(self.grid)
+        self.box_size = isqrt(self.size)
         
-        # Vérifier la colonne
-        for r in range(self.size):
-            if self.grid[r][col] == num:
-                return False
+        self.row_sets = [set() for _ in range(self.size)]
+        self.col_sets = [set() for _ in range(self.size)]
+        self.box_sets = [set() for _ in range(self.size)]
         
-        # Vérifier le sous-carré
-        start_row = (row // self.box_size) * self.box_size
-        start_col = (col // self.box_size) * self.box_size
+        # Cellules vides, rangées à l'envers : la première cellule vide
+        # (ordre de lecture) est en fin de liste et se retire en O(1)
+        self.empty = []
         
-        for r in range(start_row, start_row + self.box_size):
-            for c in range(start_col, start_col + self.box_size):
-                if self.grid[r][c] == num:
-                    return False
+        for row, grid_row in enumerate(self.grid):
+            for col, value in enumerate(grid_row):
+                if value != 0:
+                    self.row_sets[row].add(value)
+                    self.col_sets[col].add(value)
+                    self.box_sets[self.box_index(row, col)].add(value)
+                else:
+                    self.empty.append((row, col))
         
-        return True
+        self.empty.reverse()
     
-    def find_empty_cell(self) -> Optional[Tuple[int, int]]:
+    def box_index(self, row: int, col: int) -> int:
         """
-        Trouve la première cellule vide dans la grille
+        Calcule l'indice du sous-carré contenant une cellule
         
+        Args:
+            row: Ligne
+            col: Colonne
+            
         Returns:
-            Tuple (row, col) de la première cellule vide, ou None si la grille est complète
+            Indice du sous-carré (de 0 à size-1)
         """
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.grid[row][col] == 0:
-                    return (row, col)
-        return None
+        return (row // self.box_size) * self.box_size + col // self.box_size
     
     def solve(self) -> bool:
         """
         Résout la grille avec l'algorithme de backtracking
         
         Principe:
-        1. Trouver une cellule vide
+        1. Prendre la première cellule vide (retirée de self.empty, sans
+           parcourir la grille)
         2. Essayer tous les nombres possibles (1 à size)
         3. Si un nombre est valide, le placer et continuer récursivement
         4. Si aucune solution n'est trouvée, revenir en arrière (backtrack)
@@ -80,28 +78,39 @@ class SudokuSolver:
         Returns:
             True si la grille est résolue, False sinon
         """
-        # Trouver la première cellule vide
-        empty_cell = self.find_empty_cell()
-        
         # Si pas de cellule vide, la grille est complète
-        if not empty_cell:
+        if not self.empty:
             return True
         
-        row, col = empty_cell
+        # Prendre la première cellule vide
+        row, col = self.empty.pop()
+        grid_row = self.grid[row]
+        row_set = self.row_sets[row]
+        col_set = self.col_sets[col]
+        box_set = self.box_sets[self.box_index(row, col)]
         
         # Essayer tous les nombres de 1 à size
         for num in range(1, self.size + 1):
-            # Vérifier si le nombre est valide à cette position
-            if self.is_valid(row, col, num):
-                # Placer le nombre
-                self.grid[row][col] = num
-                
-                # Continuer récursivement
-                if self.solve():
-                    return True
-                
-                # Backtrack: annuler le placement
-                self.grid[row][col] = 0
+            # Vérifier si le nombre est déjà dans la ligne, la colonne ou le sous-carré
+            if num in row_set or num in col_set or num in box_set:
+                continue
+            
+            # Placer le nombre
+            grid_row[col] = num
+            row_set.add(num)
+            col_set.add(num)
+            box_set.add(num)
+            
+            # Continuer récursivement
+            if self.solve():
+                return True
+            
+            # Backtrack: annuler le placement
+            grid_row[col] = 0
+            row_set.discard(num)
+            col_set.discard(num)
+            box_set.discard(num)
         
-        # Aucune solution trouvée
+        # Aucune solution trouvée : la cellule redevient vide
+        self.empty.append((row, col))
         return False
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Algorithme de résolution de Sudoku par Dancing Links (Algorithme X de Knuth)
+Le Sudoku est formulé comme un problème de couverture exacte
+"""
+
+from itertools import chain
+from math import isqrt
+from typing import List, Optional
+
+
+class DLX:
+    """
+    Résolution d'un problème de couverture exacte avec les « Dancing Links »
+    
+    La matrice creuse est une liste circulaire doublement chaînée dans les
+    quatre directions : chaque 1 de la matrice est un nœud relié à ses
+    voisins de gauche, droite, haut et bas. Les nœuds sont des indices dans
+    des listes (left, right, up, down) plutôt que des objets, ce qui évite
+    un accès d'attribut par déplacement.
+    
+    Le nœud 0 est la racine, les nœuds 1 à num_columns sont les en-têtes
+    de colonnes, les suivants sont les 1 de la matrice.
+    """
+    
+    def __init__(self, num_columns: int):
+        """
+        Crée une matrice vide
+        
+        Args:
+            num_columns: Nombre de contraintes (colonnes) à couvrir
+        """
+        headers = num_columns + 1
+        self.left = [i - 1 for i in range(headers)]
+        self.left[0] = num_columns
+        self.right = [i + 1 for i in range(headers)]
+        self.right[num_columns] = 0
+        self.up = list(range(headers))
+        self.down = list(range(headers))
+        self.column = list(range(headers))
+        # Nombre de nœuds encore présents dans chaque colonne
+        self.count = [0] * headers
+        # Identifiant de la ligne de chaque nœud (-1 pour la racine et les en-têtes)
+        self.row_id = [-1] * headers
+    
+    def add_row(self, row_id, columns: List[int]):
+        """
+        Ajoute une ligne à la matrice
+        
+        Args:
+            row_id: Identifiant renvoyé par search si la ligne est retenue
+            columns: Indices (à partir de 0) des colonnes couvertes par la ligne
+        """
+        left, right, up, down = self.left, self.right, self.up, self.down
+        first = None
+        
+        for col in columns:
+            header = col + 1
+            node = len(self.column)
+            self.column.append(header)
+            self.row_id.append(row_id)
+            self.count[header] += 1
+            
+            # Insérer le nœud en bas de sa colonne
+            up.append(up[header])
+            down.append(header)
+            down[up[header]] = node
+            up[header] = node
+            
+            # Insérer le nœud à la fin de sa ligne
+            if first is None:
+                first = node
+                left.append(node)
+                right.append(node)
+            else:
+                left.append(left[first])
+                right.append(first)
+                right[left[first]] = node
+                left[first] = node
+    
+    def _cover(self, header: int):
+        """Retire une colonne et toutes les lignes qui la couvrent"""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, count = self.column, self.count
+        
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        
+        i = down[header]
+        while i != header:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                count[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+    
+    def _uncover(self, header: int):
+        """Réinsère une colonne retirée par _cover (dans l'ordre inverse)"""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, count = self.column, self.count
+        
+        i = up[header]
+        while i != header:
+            j = left[i]
+            while j != i:
+                count[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        
+        right[left[header]] = header
+        left[right[header]] = header
+    
+    def search(self) -> Optional[list]:
+        """
+        Cherche une couverture exacte
+        
+        Returns:
+            Identifiants des lignes retenues, ou None s'il n'y a pas de solution
+        """
+        solution = []
+        if self._search(solution):
+            return [self.row_id[node] for node in solution]
+        return None
+    
+    def _search(self, solution: list) -> bool:
+        """
+        Algorithme X : choisir la colonne ayant le moins de lignes, puis
+        essayer chacune de ses lignes récursivement
+        
+        Args:
+            solution: Nœuds des lignes retenues jusqu'ici (modifiée sur place)
+        
+        Returns:
+            True si une couverture exacte a été trouvée
+        """
+        right, left, down, column, count = self.right, self.left, self.down, self.column, self.count
+        
+        # Plus aucune colonne : toutes les contraintes sont couvertes
+        if right[0] == 0:
+            return True
+        
+        # Choisir la colonne la plus contrainte
+        best = right[0]
+        header = right[best]
+        while header != 0 and count[best] > 1:
+            if count[header] < count[best]:
+                best = header
+            header = right[header]
+        
+        if count[best] == 0:
+            return False
+        
+        self._cover(best)
+        
+        row = down[best]
+        while row != best:
+            solution.append(row)
+            j = right[row]
+            while j != row:
+                self._cover(column[j])
+                j = right[j]
+            
+            if self._search(solution):
+                return True
+            
+            # Backtrack: annuler le choix de cette ligne
+            solution.pop()
+            j = left[row]
+            while j != row:
+                self._uncover(column[j])
+                j = left[j]
+            row = down[row]
+        
+        self._uncover(best)
+        return False
+
+
+class SudokuSolver:
+    """Solveur de Sudoku utilisant les Dancing Links (couverture exacte)"""
+    
+    def __init__(self, grid):
+        """
+        Initialise le solveur avec une grille
+        
+        Chaque placement (ligne r, colonne c, chiffre d) est une ligne de la
+        matrice, qui couvre quatre contraintes : la cellule (r, c) est
+        remplie, et le chiffre d est présent dans la ligne r, la colonne c
+        et le sous-carré de (r, c). Les contraintes déjà satisfaites par la
+        grille initiale et les placements incompatibles avec elle ne sont
+        pas ajoutés à la matrice.
+        
+        La grille passée en argument n'est pas modifiée ; après solve, la
+        solution est disponible dans self.grid.
+        
+        Args:
+            grid: Grille de Sudoku (liste de listes), ou grille déjà aplatie
+                (bytes/bytearray de size*size valeurs, ligne par ligne)
+        """
+        if isinstance(grid, (bytes, bytearray)):
+            self.buf = bytearray(grid)
+            self.size = isqrt(len(grid))
+        else:
+            self.buf = bytearray(chain.from_iterable(grid))
+            self.size = len(grid)
+        
+        self.box_size = isqrt(self.size)
+        self.grid = None
+        self.dlx = self._build_matrix()
+    
+    def _build_matrix(self) -> Optional[DLX]:
+        """
+        Construit la matrice de couverture exacte de la grille
+        
+        Returns:
+            La matrice, ou None si la grille initiale est contradictoire
+        """
+        size, box_size = self.size, self.box_size
+        row_mask = [0] * size
+        col_mask = [0] * size
+        box_mask = [0] * size
+        
+        # Contraintes déjà satisfaites par la grille initiale
+        for idx, value in enumerate(self.buf):
+            if value != 0:
+                row, col = divmod(idx, size)
+                box = (row // box_size) * box_size + col // box_size
+                bit = 1 << (value - 1)
+                if (row_mask[row] | col_mask[col] | box_mask[box]) & bit:
+                    return None
+                row_mask[row] |= bit
+                col_mask[col] |= bit
+                box_mask[box] |= bit
+        
+        # Numéroter uniquement les contraintes restant à couvrir. Une
+        # contrainte qu'aucun placement ne couvre donne une colonne vide :
+        # la recherche échoue alors immédiatement.
+        columns = {}
+        for idx, value in enumerate(self.buf):
+            if value == 0:
+                columns[('cell', idx)] = len(columns)
+        for unit, masks in (('row', row_mask), ('col', col_mask), ('box', box_mask)):
+            for index, mask in enumerate(masks):
+                for digit in range(1, size + 1):
+                    if not (mask >> (digit - 1)) & 1:
+                        columns[(unit, index, digit)] = len(columns)
+        
+        dlx = DLX(len(columns))
+        for idx, value in enumerate(self.buf):
+            if value != 0:
+                continue
+            row, col = divmod(idx, size)
+            box = (row // box_size) * box_size + col // box_size
+            used = row_mask[row] | col_mask[col] | box_mask[box]
+            for digit in range(1, size + 1):
+                if not (used >> (digit - 1)) & 1:
+                    dlx.add_row((idx, digit), [columns[('cell', idx)],
+                                               columns[('row', row, digit)],
+                                               columns[('col', col, digit)],
+                                               columns[('box', box, digit)]])
+        
+        return dlx
+    
+    def solve(self) -> bool:
+        """
+        Résout la grille par recherche d'une couverture exacte
+        
+        Returns:
+            True si la grille est résolue, False sinon
+        """
+        if self.dlx is None:
+            return False
+        
+        placements = self.dlx.search()
+        if placements is None:
+            return False
+        
+        for idx, digit in placements:
+            self.buf[idx] = digit
+        
+        size = self.size
+        self.grid = [list(self.buf[row * size:(row + 1) * size]) for row in range(size)]
+        return True
@@ -5,7 +5,15 @@ Script dédié uniquement à la création et génération de puzzles de Sudoku
 """
 
 import random
-from utils import SudokuGrid, save_grid_to_file, value_to_char
+from math import isqrt
+from typing import Dict, Optional
+from utils import SudokuGrid, is_perfect_square, save_grid_to_file, value_to_char
+from solvers.sudoku_solver_backtracking import SudokuSolver
+
+
+# Une grille complète (à plat) par taille : les suivantes en sont dérivées
+# par symétrie au lieu d'être remplies à nouveau par backtracking
+_GRID_CACHE: Dict[int, bytes] = {}
 
 
 class SudokuGenerator:
@@ -18,40 +26,139 @@ class SudokuGenerator:
         """
         Génère une grille de Sudoku complète et valide
         
+        La première grille d'une taille donnée est remplie par backtracking
+        puis mise en cache ; les suivantes sont obtenues en lui appliquant
+        des transformations aléatoires qui préservent la validité (voir
+        _transform), sans aucune recherche.
+        
         Returns:
             Grille de Sudoku complètement remplie
         """
         grid = SudokuGrid(self.size)
-        self._fill_grid(grid)
+        
+        base = _GRID_CACHE.get(self.size)
+        if base is None:
+            self._fill_grid(grid)
+            _GRID_CACHE[self.size] = bytes(grid.grid)
+        else:
+            grid.grid = self._transform(base)
+        
         return grid
     
-    def _fill_grid(self, grid: SudokuGrid) -> bool:
+    def _transform(self, base: bytes) -> bytes:
+        """
+        Dérive une nouvelle grille complète d'une grille complète existante
+        
+        Transformations appliquées (chacune conserve une grille valide):
+        - permutation des chiffres
+        - permutation des bandes (groupes de box_size lignes), puis des
+          lignes à l'intérieur de chaque bande ; idem pour les colonnes
+        - transposition, une fois sur deux
+        
+        Args:
+            base: Grille complète à plat
+            
+        Returns:
+            Nouvelle grille complète à plat
+        """
+        size = self.size
+        box_size = isqrt(size)
+        
+        def shuffled_lines():
+            # Ordre aléatoire des bandes, puis des lignes dans chaque bande
+            bands = list(range(box_size))
+            random.shuffle(bands)
+            lines = []
+            for band in bands:
+                band_lines = list(range(band * box_size, (band + 1) * box_size))
+                random.shuffle(band_lines)
+                lines.extend(band_lines)
+            return lines
+        
+        rows, cols = shuffled_lines(), shuffled_lines()
+        if random.random() < 0.5:
+            # Transposition : la cellule (r, c) est lue en (c, r)
+            cells = bytes(base[col * size + row] for row in rows for col in cols)
+        else:
+            cells = bytes(base[row * size + col] for row in rows for col in cols)
+        
+        digits = list(range(1, size + 1))
+        random.shuffle(digits)
+        table = bytearray(range(256))
+        table[1:size + 1] = digits
+        return cells.translate(table)
+    
+    def _fill_grid(self, grid: SudokuGrid, empty: Optional[set] = None) -> bool:
         """
         Remplit récursivement la grille avec des nombres valides
+        
+        À chaque étape, on remplit la cellule vide ayant le moins de
+        candidats (heuristique MRV), ce qui limite fortement les retours
+        en arrière sur les grandes grilles.
+        
+        Args:
+            grid: Grille à remplir
+            empty: Indices (à plat) des cellules vides, tenu à jour au fil de
+                la récursion ; calculé à partir de la grille si absent
         """
-        empty_cell = grid.find_empty_cell()
-        if not empty_cell:
+        if empty is None:
+            empty = {idx for idx, value in enumerate(grid.grid) if value == 0}
+        
+        # Variables locales : évite un appel de méthode par cellule vide
+        row_mask, col_mask, box_mask = grid.row_mask, grid.col_mask, grid.box_mask
+        box_idx = grid._box_idx
+        full_mask = (1 << self.size) - 1
+        
+        # Chercher la cellule vide la plus contrainte
+        best_cell = None
+        best_candidates = 0
+        best_count = self.size + 1
+        
+        # Ne parcourir que les cellules vides, pas toute la grille
+        size = self.size
+        for idx in empty:
+            row, col = divmod(idx, size)
+            used = row_mask[row] | col_mask[col] | box_mask[box_idx[idx]]
+            candidates = ~used & full_mask
+            count = candidates.bit_count()
+            if count < best_count:
+                best_cell, best_candidates, best_count = idx, candidates, count
+        
+        # Plus de cellule vide : la grille est complète
+        if best_cell is None:
             return True
         
-        row, col = empty_cell
-        numbers = list(range(1, self.size + 1))
+        row, col = divmod(best_cell, size)
+        empty.discard(best_cell)
+        
+        # Ne mélanger que les nombres valides (souvent bien moins que size),
+        # extraits directement des bits à 1 du masque de candidats
+        numbers = []
+        while best_candidates:
+            bit = best_candidates & -best_candidates
+            best_candidates ^= bit
+            numbers.append(bit.bit_length())
         random.shuffle(numbers)
         
         for num in numbers:
-            if grid.is_valid(row, col, num):
-                grid.grid[row][col] = num
-                
-                if self._fill_grid(grid):
-                    return True
-                
-                grid.grid[row][col] = 0
+            grid._place(row, col, num)
+            
+            if self._fill_grid(grid, empty):
+                return True
+            
+            grid._unplace(row, col, num)
         
+        empty.add(best_cell)
         return False
     
     def create_puzzle(self, difficulty: str = "medium") -> SudokuGrid:
         """
         Crée un puzzle en supprimant des cellules d'une grille complète
         
+        Une cellule n'est supprimée que si la grille garde une solution unique ;
+        pour les grandes difficultés, il peut donc rester plus de cellules
+        remplies que prévu.
+        
         Args:
             difficulty: Niveau de difficulté ("easy", "medium", "hard")
             
@@ -75,9 +182,19 @@ class SudokuGenerator:
         positions = [(i, j) for i in range(self.size) for j in range(self.size)]
         random.shuffle(positions)
         
-        for i in range(cells_to_remove):
-            row, col = positions[i]
-            complete_grid.grid[row][col] = 0
+        removed = 0
+        for row, col in positions:
+            if removed == cells_to_remove:
+                break
+            
+            value = complete_grid.grid[row * self.size + col]
+            complete_grid._unplace(row, col, value)
+            
+            # Remettre le chiffre si la grille n'a plus une solution unique
+            if SudokuSolver(complete_grid.grid).count_solutions(2) != 1:
+                complete_grid._place(row, col, value)
+            else:
+                removed += 1
         
         return complete_grid
 
@@ -88,7 +205,7 @@ def generate_single_puzzle():
     
     try:
         size = int(input("Entrez la dimension de la grille (4, 9, 16, 25, etc.): "))
-        if int(size**0.5)**2 != size:
+        if not is_perfect_square(size):
             print("Erreur: La dimension doit être un carré parfait (4, 9, 16, 25, etc.)")
             return
         
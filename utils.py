@@ -4,7 +4,103 @@ Utilitaires pour les grilles de Sudoku
 Classes et fonctions communes de sauvegarde, chargement et manipulation
 """
 
+import dbm
+import hashlib
 import os
+import shelve
+import sys
+from array import array
+from collections import deque
+from itertools import chain
+from math import isqrt
+from typing import Dict, Optional, Set, Union
+
+
+# Table de traduction caractère -> valeur pour bytes.translate
+# (0xFF marque un caractère invalide)
+_CHAR_TABLE = bytearray(b'\xff' * 256)
+_CHAR_TABLE[ord('.')] = 0
+for _digit in range(10):
+    _CHAR_TABLE[ord('0') + _digit] = _digit
+for _offset in range(26):
+    _CHAR_TABLE[ord('A') + _offset] = 10 + _offset
+    _CHAR_TABLE[ord('a') + _offset] = 10 + _offset
+_CHAR_TABLE = bytes(_CHAR_TABLE)
+
+# Table inverse valeur -> caractère ('.', '1'-'9', 'A'-'Z') pour bytes.translate
+# (0x00 marque une valeur invalide)
+_VALUE_TABLE = b'.123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'.ljust(256, b'\x00')
+
+# Dossiers déjà créés par _ensure_dir (évite un appel système par sauvegarde)
+_MKDIR_CACHE: Set[str] = set()
+
+
+def _ensure_dir(path: str):
+    """
+    Crée un dossier (et ses parents) s'il n'a pas déjà été créé
+    
+    Args:
+        path: Dossier à créer ; une chaîne vide désigne le dossier courant
+    """
+    if path and path not in _MKDIR_CACHE:
+        os.makedirs(path, exist_ok=True)
+        _MKDIR_CACHE.add(path)
+
+
+def is_perfect_square(n: int) -> bool:
+    """
+    Vérifie qu'un entier est un carré parfait (calcul exact, sans flottant)
+    
+    Args:
+        n: Entier positif à tester
+        
+    Returns:
+        True si n est le carré d'un entier, False sinon
+    """
+    root = isqrt(n)
+    return root * root == n
+
+
+def decode_chars(chars: Union[str, bytes]) -> Optional[bytes]:
+    """
+    Convertit toute une chaîne de caractères en valeurs numériques en une
+    seule passe (bytes.translate, au niveau C)
+    
+    Les caractères invalides (y compris les octets non ASCII) donnent la
+    valeur 255 : il suffit de comparer le maximum à la taille de la grille
+    pour détecter une erreur.
+    
+    Args:
+        chars: Caractères à convertir ('.', '0'-'9', 'A'-'Z', 'a'-'z'),
+            en str ou directement en bytes lus depuis un fichier
+        
+    Returns:
+        Valeurs correspondantes, ou None si la chaîne (str) n'est pas en ASCII
+    """
+    if isinstance(chars, bytes):
+        return chars.translate(_CHAR_TABLE)
+    
+    try:
+        return chars.encode('ascii').translate(_CHAR_TABLE)
+    except UnicodeEncodeError:
+        return None
+
+
+def encode_values(values: bytes) -> bytes:
+    """
+    Convertit des valeurs numériques en caractères en une seule passe
+    (inverse de decode_chars)
+    
+    Args:
+        values: Valeurs à convertir (0 à 35)
+        
+    Returns:
+        Caractères correspondants ('.', '1'-'9', 'A'-'Z'), en ASCII
+    """
+    chars = values.translate(_VALUE_TABLE)
+    if 0 in chars:
+        raise ValueError(f"Valeur invalide: {values[chars.index(0)]}")
+    return chars
 
 
 def char_to_value(char: str) -> int:
@@ -18,14 +114,12 @@ def char_to_value(char: str) -> int:
     Returns:
         Valeur numérique correspondante
     """
-    if char == '.':
-        return 0
-    elif char.isdigit():
-        return int(char)
-    elif char.upper() in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-        return ord(char.upper()) - ord('A') + 10
-    else:
+    # Lecture directe dans la table de traduction (0xFF : caractère invalide)
+    code = ord(char) if len(char) == 1 else 0xFF
+    value = _CHAR_TABLE[code] if code < 256 else 0xFF
+    if value == 0xFF:
         raise ValueError(f"Caractère invalide: '{char}'")
+    return value
 
 
 def value_to_char(value: int) -> str:
@@ -52,26 +146,111 @@ def value_to_char(value: int) -> str:
 class SudokuGrid:
     """Classe pour représenter et manipuler une grille de Sudoku"""
     
+    # Indice du sous-carré de chaque cellule (par indice à plat), calculé une
+    # seule fois par taille et partagé par toutes les grilles
+    _BOX_IDX: Dict[int, array] = {}
+    
     def __init__(self, size: int = 9):
         """
         Initialise une grille de Sudoku
         
+        Les valeurs sont stockées à plat dans un bytearray de size*size
+        octets : la cellule (r, c) est à l'indice r*size + c.
+        
+        En plus des valeurs, la grille maintient des masques de bits : le bit
+        k de row_mask[r] (resp. col_mask[c], box_mask[b]) est à 1 si le chiffre
+        k+1 est présent dans la ligne r (resp. colonne c, sous-carré b).
+        Pour les garder cohérents, les cellules se modifient avec _place et
+        _unplace (ou en réaffectant self.grid en entier).
+        
         Args:
             size: Taille de la grille (doit être un carré parfait : 4, 9, 16, 25, etc.)
         """
-        if int(size**0.5)**2 != size:
+        if not is_perfect_square(size):
             raise ValueError(f"La taille {size} n'est pas un carré parfait")
         
         self.size = size
-        self.box_size = int(size**0.5)  # Taille des sous-carrés
-        self.grid = [[0 for _ in range(size)] for _ in range(size)]
+        self.box_size = box_size = isqrt(size)  # Taille des sous-carrés
+        
+        self._box_idx = SudokuGrid._BOX_IDX.get(size)
+        if self._box_idx is None:
+            self._box_idx = SudokuGrid._BOX_IDX[size] = array('B', [
+                (row // box_size) * box_size + col // box_size
+                for row in range(size) for col in range(size)])
+        
+        self.grid = bytearray(size * size)
+    
+    @property
+    def grid(self) -> bytearray:
+        """Valeurs de la grille à plat (ligne par ligne, 0 pour une cellule vide)"""
+        return self._grid
+    
+    @grid.setter
+    def grid(self, values):
+        """
+        Remplace toutes les valeurs de la grille et recalcule les masques
+        
+        Args:
+            values: Valeurs à plat (bytes/bytearray) ou liste de listes
+        """
+        if isinstance(values, (bytes, bytearray)):
+            self._grid = bytearray(values)
+        else:
+            self._grid = bytearray(chain.from_iterable(values))
+        
+        self.row_mask = [0] * self.size
+        self.col_mask = [0] * self.size
+        self.box_mask = [0] * self.size
+        
+        for idx, value in enumerate(self._grid):
+            if value != 0:
+                row, col = divmod(idx, self.size)
+                bit = 1 << (value - 1)
+                self.row_mask[row] |= bit
+                self.col_mask[col] |= bit
+                self.box_mask[self._box_idx[idx]] |= bit
     
     def copy(self):
         """Crée une copie de la grille"""
         new_grid = SudokuGrid(self.size)
-        new_grid.grid = [row[:] for row in self.grid]
+        new_grid._grid = bytearray(self._grid)
+        new_grid.row_mask = self.row_mask[:]
+        new_grid.col_mask = self.col_mask[:]
+        new_grid.box_mask = self.box_mask[:]
         return new_grid
     
+    def _place(self, row: int, col: int, num: int):
+        """
+        Place un nombre dans une cellule vide et met à jour les masques
+        
+        Args:
+            row: Ligne de la cellule
+            col: Colonne de la cellule
+            num: Nombre à placer
+        """
+        idx = row * self.size + col
+        bit = 1 << (num - 1)
+        self._grid[idx] = num
+        self.row_mask[row] |= bit
+        self.col_mask[col] |= bit
+        self.box_mask[self._box_idx[idx]] |= bit
+    
+    def _unplace(self, row: int, col: int, num: int):
+        """
+        Retire un nombre d'une cellule et met à jour les masques
+        
+        Args:
+            row: Ligne de la cellule
+            col: Colonne de la cellule
+            num: Nombre présent dans la cellule
+        """
+        idx = row * self.size + col
+        bit = 1 << (num - 1)
+        self._grid[idx] = 0
+        self.row_mask[row] &= ~bit
+        self.col_mask[col] &= ~bit
+        self.box_mask[self._box_idx[idx]] &= ~bit
+    
     def find_empty_cell(self):
         """
         Trouve la première cellule vide dans la grille
@@ -79,11 +258,10 @@ class SudokuGrid:
         Returns:
             Tuple (row, col) de la cellule vide ou None si la grille est complète
         """
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.grid[i][j] == 0:
-                    return (i, j)
-        return None
+        idx = self._grid.find(0)
+        if idx < 0:
+            return None
+        return divmod(idx, self.size)
     
     def is_valid(self, row: int, col: int, num: int) -> bool:
         """
@@ -97,55 +275,181 @@ class SudokuGrid:
         Returns:
             True si le placement est valide, False sinon
         """
-        # Vérifier la ligne
-        if num in self.grid[row]:
-            return False
+        used = self.row_mask[row] | self.col_mask[col] | self.box_mask[self._box_idx[row * self.size + col]]
+        return not (used >> (num - 1)) & 1
+    
+    def _propagate(self) -> bool:
+        """
+        Place d'office les cellules n'ayant qu'un seul candidat (« singletons nus »)
         
-        # Vérifier la colonne
-        for i in range(self.size):
-            if self.grid[i][col] == num:
-                return False
+        Une file de travail contient les cellules vides à réexaminer : à
+        chaque placement, les cellules vides de la même ligne, colonne et
+        sous-carré y sont remises, puisque leurs candidats ont changé.
+        La grille est modifiée sur place ; en cas d'impasse, elle reste
+        partiellement remplie.
         
-        # Vérifier le sous-carré
-        box_row = (row // self.box_size) * self.box_size
-        box_col = (col // self.box_size) * self.box_size
+        Returns:
+            False si une cellule vide n'a plus aucun candidat, True sinon
+        """
+        size = self.size
+        box_size = self.box_size
+        full_mask = (1 << size) - 1
+        cells = self._grid
+        box_idx = self._box_idx
+        row_mask, col_mask, box_mask = self.row_mask, self.col_mask, self.box_mask
         
-        for i in range(box_row, box_row + self.box_size):
-            for j in range(box_col, box_col + self.box_size):
-                if self.grid[i][j] == num:
-                    return False
+        queue = deque(idx for idx, value in enumerate(cells) if value == 0)
+        while queue:
+            idx = queue.popleft()
+            if cells[idx] != 0:
+                continue
+            
+            row, col = divmod(idx, size)
+            candidates = ~(row_mask[row] | col_mask[col] | box_mask[box_idx[idx]]) & full_mask
+            
+            if not candidates:
+                return False
+            if candidates & (candidates - 1):
+                continue
+            
+            # Un seul candidat : le placer et réexaminer les voisins vides
+            self._place(row, col, candidates.bit_length())
+            
+            box_row = (row // box_size) * box_size
+            box_col = (col // box_size) * box_size
+            peers = chain(range(row * size, (row + 1) * size),
+                          range(col, size * size, size),
+                          (r * size + c for r in range(box_row, box_row + box_size)
+                           for c in range(box_col, box_col + box_size)))
+            queue.extend(peer for peer in peers if cells[peer] == 0)
         
         return True
     
     def display(self):
-        """Affiche la grille de manière lisible"""
-        print(f"\nGrille Sudoku {self.size}x{self.size}:")
+        """
+        Affiche la grille de manière lisible
+        
+        Toutes les lignes sont construites avec str.join puis écrites en un
+        seul appel à sys.stdout.write.
+        """
+        size, box_size = self.size, self.box_size
         
         # Calculer la largeur d'une cellule (2 pour <=9, 3 pour >=10)
-        cell_width = 3 if self.size > 9 else 2
-        separator_width = self.size * cell_width + self.box_size + 1
+        cell_width = 3 if size > 9 else 2
+        separator = "-" * (size * cell_width + box_size + 1)
+        
+        # Chaque cellule est un caractère précédé de sa marge
+        padding = " " * (cell_width - 1)
+        cells = [padding + char for char in encode_values(self._grid).decode('ascii')]
+        
+        lines = [f"\nGrille Sudoku {size}x{size}:", separator]
+        for i in range(size):
+            if i > 0 and i % box_size == 0:
+                lines.append(separator)
+            
+            offset = i * size
+            lines.append("|" + "|".join("".join(cells[start:start + box_size])
+                                        for start in range(offset, offset + size, box_size)) + "|")
         
-        print("-" * separator_width)
+        lines.append(separator)
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+class SolutionCache:
+    """
+    Cache disque des solutions déjà calculées (module shelve)
+    
+    Une grille est identifiée par l'empreinte blake2b de ses valeurs, après
+    renumérotation des chiffres dans leur ordre d'apparition : deux grilles
+    qui ne diffèrent que par une permutation des chiffres partagent la même
+    entrée. La solution est stockée sous cette forme canonique et
+    renumérotée à la lecture.
+    
+    Le fichier n'est ouvert que le temps d'une lecture ou d'une écriture ;
+    s'il est inaccessible, le cache se comporte comme s'il était vide.
+    """
+    
+    def __init__(self, filename: str = "data/.solve_cache.db"):
+        """
+        Args:
+            filename: Chemin du fichier de cache
+        """
+        self.filename = filename
+    
+    @staticmethod
+    def _canonical(grid: SudokuGrid):
+        """
+        Renumérote les chiffres de la grille dans leur ordre d'apparition
         
-        for i in range(self.size):
-            if i > 0 and i % self.box_size == 0:
-                print("-" * separator_width)
+        Args:
+            grid: Grille à renuméroter
             
-            row_str = "|"
-            for j in range(self.size):
-                if j > 0 and j % self.box_size == 0:
-                    row_str += "|"
-                
-                cell_char = value_to_char(self.grid[i][j])
-                if self.size > 9:
-                    row_str += f" {cell_char:>2}"
-                else:
-                    row_str += f" {cell_char}"
+        Returns:
+            Tuple (clé, table) : l'empreinte de la grille renumérotée et la
+            table de traduction chiffre d'origine -> chiffre canonique
+        """
+        table = bytearray(range(256))
+        label = 0
+        seen = set()
+        for value in grid.grid:
+            if value != 0 and value not in seen:
+                seen.add(value)
+                label += 1
+                table[value] = label
+        
+        # Les chiffres absents de la grille prennent les numéros restants
+        for value in range(1, grid.size + 1):
+            if value not in seen:
+                label += 1
+                table[value] = label
+        
+        canonical = bytes(grid.grid).translate(table)
+        return hashlib.blake2b(canonical).hexdigest(), bytes(table)
+    
+    def get(self, grid: SudokuGrid) -> Optional[SudokuGrid]:
+        """
+        Cherche la solution d'une grille dans le cache
+        
+        Args:
+            grid: Grille à résoudre
             
-            row_str += "|"
-            print(row_str)
+        Returns:
+            Grille résolue, ou None si elle n'est pas dans le cache
+        """
+        key, table = self._canonical(grid)
+        try:
+            with shelve.open(self.filename, 'r') as cache:
+                canonical = cache.get(key)
+        except dbm.error:  # erreurs dbm et OSError
+            return None
+        
+        if canonical is None:
+            return None
+        
+        # Revenir aux chiffres de la grille d'origine
+        inverse = bytearray(range(256))
+        for value in range(grid.size + 1):
+            inverse[table[value]] = value
+        
+        solution = SudokuGrid(grid.size)
+        solution.grid = canonical.translate(inverse)
+        return solution
+    
+    def put(self, grid: SudokuGrid, solution: SudokuGrid):
+        """
+        Enregistre la solution d'une grille dans le cache
         
-        print("-" * separator_width)
+        Args:
+            grid: Grille d'origine
+            solution: Grille résolue
+        """
+        key, table = self._canonical(grid)
+        try:
+            _ensure_dir(os.path.dirname(self.filename))
+            with shelve.open(self.filename) as cache:
+                cache[key] = bytes(solution.grid).translate(table)
+        except dbm.error:  # erreurs dbm et OSError
+            pass
 
 
 def load_grid_from_file(filename: str) -> SudokuGrid:
@@ -161,8 +465,9 @@ def load_grid_from_file(filename: str) -> SudokuGrid:
     if not os.path.exists(filename):
         raise FileNotFoundError(f"Le fichier {filename} n'existe pas")
     
-    with open(filename, 'r') as file:
-        lines = [line.strip() for line in file.readlines() if line.strip()]
+    # Lire tout le fichier d'un bloc et découper en lignes sans décoder le texte
+    with open(filename, 'rb') as file:
+        lines = [line for line in (raw.strip() for raw in file.read().splitlines()) if line]
     
     if not lines:
         raise ValueError("Le fichier est vide")
@@ -171,26 +476,39 @@ def load_grid_from_file(filename: str) -> SudokuGrid:
     size = len(lines)
     
     # Vérifier que c'est un carré parfait
-    if int(size**0.5)**2 != size:
+    if not is_perfect_square(size):
         raise ValueError(f"La taille {size} n'est pas un carré parfait")
     
     grid = SudokuGrid(size)
+    cells = bytearray()
     
     for i, line in enumerate(lines):
-        # Supprimer les espaces et traiter chaque caractère
-        chars = line.replace(' ', '')
+        # Supprimer les espaces et convertir toute la ligne en une passe
+        chars = line.replace(b' ', b'')
+        
+        # Un caractère non ASCII occupe plusieurs octets : compter les caractères
+        length = len(chars) if chars.isascii() else len(chars.decode('utf-8', 'replace'))
+        if length != size:
+            raise ValueError(f"Ligne {i+1} a une longueur incorrecte: {length} au lieu de {size}")
+        
+        values = decode_chars(chars)
         
-        if len(chars) != size:
-            raise ValueError(f"Ligne {i+1} a une longueur incorrecte: {len(chars)} au lieu de {size}")
+        if values is None or max(values) > size:
+            # Repasser caractère par caractère pour signaler précisément le premier fautif
+            values = []
+            for j, char in enumerate(chars.decode('utf-8', 'replace')):
+                try:
+                    num = char_to_value(char)
+                    if num < 0 or num > size:
+                        raise ValueError(f"Nombre invalide {num} à la position ({i+1}, {j+1})")
+                    values.append(num)
+                except ValueError as e:
+                    raise ValueError(f"Caractère invalide '{char}' à la position ({i+1}, {j+1}): {e}")
         
-        for j, char in enumerate(chars):
-            try:
-                num = char_to_value(char)
-                if num < 0 or num > size:
-                    raise ValueError(f"Nombre invalide {num} à la position ({i+1}, {j+1})")
-                grid.grid[i][j] = num
-            except ValueError as e:
-                raise ValueError(f"Caractère invalide '{char}' à la position ({i+1}, {j+1}): {e}")
+        cells += bytes(values)
+    
+    # Affecter toutes les cellules d'un coup (recalcule les masques)
+    grid.grid = cells
     
     return grid
 
@@ -199,18 +517,21 @@ def save_grid_to_file(grid: SudokuGrid, filename: str):
     """
     Sauvegarde une grille de Sudoku dans un fichier
     
+    Toute la grille est convertie en caractères en une passe
+    (bytes.translate) puis écrite d'un seul bloc.
+    
     Args:
         grid: Grille à sauvegarder
         filename: Nom du fichier de destination
     """
-    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    chars = encode_values(grid.grid)
+    size = grid.size
+    data = b"\n".join(chars[i * size:(i + 1) * size] for i in range(size)) + b"\n"
+    
+    _ensure_dir(os.path.dirname(filename))
     
-    with open(filename, 'w') as file:
-        for row in grid.grid:
-            line = ""
-            for cell in row:
-                line += value_to_char(cell)
-            file.write(line + "\n")
+    with open(filename, 'wb') as file:
+        file.write(data)
     
     print(f"Grille sauvegardée dans {filename}")
 